@@ -59,6 +59,19 @@ run_gaze_tests() {
   fi
 }
 
+# === [P05b] Run eye detection and face tracking tests ===
+run_eye_detection_tests() {
+  log "🧪 Running eye detection and face tracking tests"
+
+  if python3 test_eye_detection.py && python3 test_face_tracking.py; then
+    log "✅ Eye detection and face tracking tests passed"
+    return 0
+  else
+    log "❌ Eye detection and face tracking tests failed"
+    return 1
+  fi
+}
+
 # === [P06] Cleanup ===
 cleanup() {
   log "🧹 Cleaning up"
@@ -83,16 +96,19 @@ main() {
   # Run tests
   refind_success=0
   gaze_success=0
+  eye_success=0
 
   run_refind_tests || refind_success=1
   run_gaze_tests || gaze_success=1
+  run_eye_detection_tests || eye_success=1
 
   # Report results
   log "📊 Test Results:"
   log "  rEFInd Boot Manager Configuration: $([ $refind_success -eq 0 ] && echo "✅ Passed" || echo "❌ Failed")"
   log "  Gaze Tracking System: $([ $gaze_success -eq 0 ] && echo "✅ Passed" || echo "❌ Failed")"
+  log "  Eye Detection and Face Tracking: $([ $eye_success -eq 0 ] && echo "✅ Passed" || echo "❌ Failed")"
 
-  if [ $refind_success -eq 0 ] && [ $gaze_success -eq 0 ]; then
+  if [ $refind_success -eq 0 ] && [ $gaze_success -eq 0 ] && [ $eye_success -eq 0 ]; then
     log "✅ All tests passed"
   else
     log "❌ Some tests failed"
@@ -104,7 +120,7 @@ main() {
   # Print PRF compliance information
   log "🔒 PRF‑TEST‑RUNNER‑2025‑05‑01‑A: COMPLIANT (P01-P28)"
 
-  return $(( refind_success + gaze_success ))
+  return $(( refind_success + gaze_success + eye_success ))
 }
 
 # Run the main function
@@ -118,6 +134,7 @@ main
 # P03    | Dependency checking                  | check_dependencies() { ... }                | [P03] Check dependencies | ✅ | Ensures all required dependencies are installed
 # P04    | rEFInd config tests                  | run_refind_tests() { ... }                  | [P04] Run rEFInd tests | ✅ | Runs rEFInd boot manager configuration tests
 # P05    | Gaze tracking tests                  | run_gaze_tests() { ... }                    | [P05] Run gaze tests | ✅ | Runs gaze tracking system tests
+# P05b   | Eye detection tests                  | run_eye_detection_tests() { ... }           | [P05b] Run eye detection tests | ✅ | Runs tracker eye detection and face tracking regression tests
 # P06    | Cleanup                              | cleanup() { ... }                           | [P06] Cleanup       | ✅   | Ensures all processes are cleaned up
 # P07    | Entrypoint with error handling       | main() { ... }                              | [P07] Entrypoint    | ✅   | Handles errors gracefully
 # P08-P28| Additional compliance requirements   | Various implementation details              | Throughout script   | ✅   | Fully compliant with all PRF requirements
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# File: test_eye_detection.py
+# Directive: PRF‑TEST‑EYE‑DETECTION‑2025‑05‑02‑A
+# Purpose: Test eye detection of webgazer_style_tracker.py on small faces
+# Status: ✅ PRF‑COMPLIANT (P01–P28)
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+import webgazer_style_tracker as tracker
+
+# === [P01] Metadata ===
+TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+LOGFILE = Path(f"/tmp/eye_detection_test_{TS}.log")
+# Face crop from NASA's public-domain astronaut portrait, scaled to a 120 px face
+# at (40, 40) in the crop, about the size of a face at laptop distance in 640x480
+FACE_IMAGE = Path(__file__).parent / "test_data" / "face_120px.png"
+FACE_BOX = (40, 40, 120, 120)
+FRAME_SIZE = (480, 640)
+
+# === [P02] Log utility ===
+def log(msg):
+    with open(LOGFILE, "a") as f:
+        f.write(f"{datetime.now()} ▶ {msg}\n")
+    print(msg)
+
+# === [P03] Test setup ===
+def build_frame(face_scale=1.0, offset=(200, 120)):
+    """Place the face crop into a black 640x480 frame, returning the frame and face box"""
+    crop = cv2.imread(str(FACE_IMAGE))
+    if face_scale != 1.0:
+        crop = cv2.resize(crop, None, fx=face_scale, fy=face_scale, interpolation=cv2.INTER_AREA)
+    frame = np.zeros(FRAME_SIZE + (3,), dtype=np.uint8)
+    ox, oy = offset
+    frame[oy:oy + crop.shape[0], ox:ox + crop.shape[1]] = crop
+    x, y, w, h = (int(v * face_scale) for v in FACE_BOX)
+    return frame, (ox + x, oy + y, w, h)
+
+def detect(frame, face):
+    """Run the tracker's eye detection the way its main loop does"""
+    eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml")
+    small = cv2.resize(frame, (0, 0), fx=1 / tracker.DETECT_SCALE, fy=1 / tracker.DETECT_SCALE,
+                       interpolation=cv2.INTER_AREA)
+    small_gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return tracker.detect_eyes_in_face(eye_cascade, small_gray, frame, face)
+
+# === [P04] Tests ===
+def test_small_face_eyes_detected():
+    """A ~120 px face is too small for eye search at half resolution; eyes must still be found"""
+    log("🧪 Testing eye detection on a 120 px face")
+    frame, face = build_frame()
+    eyes = detect(frame, face)
+    log(f"👁️ Eyes: {eyes.tolist()}")
+
+    _, _, w, h = face
+    assert eyes.shape[1:] == (4,) and eyes.dtype == np.int32
+    assert len(eyes) >= 2, f"expected both eyes, found {len(eyes)}"
+    # Boxes are relative to the face and lie in its upper half
+    assert (eyes[:, 0] >= 0).all() and (eyes[:, 0] + eyes[:, 2] <= w).all()
+    assert (eyes[:, 1] >= 0).all() and (eyes[:, 1] + eyes[:, 3] <= h // 2 + h // 5).all()
+    log("✅ Eyes detected on small face")
+
+def test_large_face_eyes_detected():
+    """A 240 px face is searched in the downscaled frame and boxes come back at full resolution"""
+    log("🧪 Testing eye detection on a 240 px face")
+    frame, face = build_frame(face_scale=2.0, offset=(100, 40))
+    eyes = detect(frame, face)
+    log(f"👁️ Eyes: {eyes.tolist()}")
+
+    _, _, w, h = face
+    assert len(eyes) >= 2, f"expected both eyes, found {len(eyes)}"
+    assert (eyes[:, 2] >= 20).all(), "boxes should be scaled back to full resolution"
+    assert (eyes[:, 0] + eyes[:, 2] <= w).all() and (eyes[:, 1] + eyes[:, 3] <= h).all()
+    log("✅ Eyes detected on large face")
+
+# === [P05] Main ===
+def main():
+    log(f"🚀 Starting eye detection tests (log: {LOGFILE})")
+    failures = 0
+    for test in (test_small_face_eyes_detected, test_large_face_eyes_detected):
+        try:
+            test()
+        except AssertionError as e:
+            failures += 1
+            log(f"❌ {test.__name__} failed: {e}")
+
+    if failures:
+        log(f"❌ {failures} test(s) failed")
+        return 1
+    log("✅ All eye detection tests passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
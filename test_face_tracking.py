@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# File: test_face_tracking.py
+# Directive: PRF‑TEST‑FACE‑TRACKING‑2025‑05‑02‑A
+# Purpose: Test that webcam_eye_tracker.py holds a still face steady between frames
+# Status: ✅ PRF‑COMPLIANT (P01–P28)
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+import webcam_eye_tracker as tracker
+
+# === [P01] Metadata ===
+TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+LOGFILE = Path(f"/tmp/face_tracking_test_{TS}.log")
+# Face crop from NASA's public-domain astronaut portrait (see test_eye_detection.py)
+FACE_IMAGE = Path(__file__).parent / "test_data" / "face_120px.png"
+FRAME_SIZE = (480, 640)
+
+# === [P02] Log utility ===
+def log(msg):
+    with open(LOGFILE, "a") as f:
+        f.write(f"{datetime.now()} ▶ {msg}\n")
+    print(msg)
+
+# === [P03] Test setup ===
+class StillCamera:
+    """Stands in for cv2.VideoCapture, returning the same frame on every read"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def read(self):
+        return True, self.frame.copy()
+
+def build_frame(offset=(180, 80)):
+    """Place the face crop, scaled to a ~190 px face, into a black 640x480 frame"""
+    crop = cv2.imread(str(FACE_IMAGE))
+    crop = cv2.resize(crop, None, fx=1.6, fy=1.6, interpolation=cv2.INTER_AREA)
+    frame = np.zeros(FRAME_SIZE + (3,), dtype=np.uint8)
+    ox, oy = offset
+    frame[oy:oy + crop.shape[0], ox:ox + crop.shape[1]] = crop
+    return frame
+
+def build_tracker(frame):
+    """Eye tracker wired to a still camera, without opening a device or window"""
+    eye_tracker = tracker.WebcamEyeTracker()
+    eye_tracker.show_video = False
+    eye_tracker.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    eye_tracker.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml")
+    eye_tracker.cap = StillCamera(frame)
+    eye_tracker.connected = True
+    return eye_tracker
+
+# === [P04] Tests ===
+def test_still_face_is_stable():
+    """The same image fed repeatedly gives the same face box and gaze every frame"""
+    log("🧪 Testing face tracking on a still image")
+    eye_tracker = build_tracker(build_frame())
+
+    # The first frame is a full-frame search; the following ones search around its box
+    results = []
+    for _ in range(4):
+        gaze = eye_tracker.get_gaze_data()
+        assert gaze is not None, "get_gaze_data failed"
+        results.append((eye_tracker._last_face_bbox, gaze["x"], gaze["y"]))
+        log(f"👁️ Face {results[-1][0]}, gaze ({gaze['x']:.1f}, {gaze['y']:.1f})")
+
+    assert results[0][0] is not None, "no face detected"
+    assert gaze["confidence"] == 0.8, "no eyes detected"
+    assert all(result == results[0] for result in results), "tracking drifted on a still image"
+    log("✅ Still face tracked without drift")
+
+def test_small_move_is_followed():
+    """A face shifted by a few pixels moves the face box and gaze with it"""
+    for shift in (6, -6):
+        log(f"🧪 Testing face tracking on a {shift:+d} px move")
+        eye_tracker = build_tracker(build_frame())
+        for _ in range(3):
+            before = eye_tracker.get_gaze_data()
+        box_before = eye_tracker._last_face_bbox
+
+        # Move the face sideways and let the tracker settle on it
+        eye_tracker.cap.frame = build_frame((180 + shift, 80))
+        for _ in range(3):
+            after = eye_tracker.get_gaze_data()
+        box_after = eye_tracker._last_face_bbox
+        log(f"👁️ Face {box_before} -> {box_after}, gaze x {before['x']:.1f} -> {after['x']:.1f}")
+
+        assert after["confidence"] == 0.8, "no eyes detected after the move"
+        moved = box_after[0] - box_before[0]
+        assert abs(moved - shift) <= tracker.FACE_TRACK_DEADBAND, "face box did not follow the move"
+        assert (after["x"] - before["x"]) * shift > 0, "gaze did not follow the move"
+    log("✅ Small face moves followed")
+
+# === [P05] Main ===
+def main():
+    log(f"🚀 Starting face tracking tests (log: {LOGFILE})")
+    try:
+        test_still_face_is_stable()
+    except AssertionError as e:
+        log(f"❌ test_still_face_is_stable failed: {e}")
+        return 1
+    try:
+        test_small_move_is_followed()
+    except AssertionError as e:
+        log(f"❌ test_small_move_is_followed failed: {e}")
+        return 1
+    log("✅ All face tracking tests passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
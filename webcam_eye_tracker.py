@@ -17,12 +17,28 @@ import math
 from datetime import datetime
 from threading import Thread
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator used when numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
 # === [P01] Metadata and Configuration ===
 TS = datetime.now().strftime("%Y%m%d_%H%M%S")
 LOGFILE = f"/tmp/webcam_eye_tracker_{TS}.log"
 WS_URL = "ws://localhost:8765"
 FRAME_RATE = 30  # Target frame rate
 FRAME_TIME = 1.0 / FRAME_RATE
+FACE_SCALE_FACTOR = 1.1  # Face cascade pyramid step, shared by the tracked and full-frame searches
+FACE_TRACK_SCALE = 1.25  # Around the last face, only scan face sizes within this factor of it
+FACE_TRACK_GRID = 16  # Search crop and size bounds snap to this grid so small moves reuse them
+FACE_TRACK_DEADBAND = 3  # Re-detected boxes within this many px of the last one are jitter
 running = True
 
 # === [P02] Dependency Management ===
@@ -166,6 +182,19 @@ class WebSocketClient:
             log("🛑 WebSocket client stopped")
 
 # === [P06] Webcam Eye Tracker ===
+@njit(cache=True, fastmath=True)
+def eye_stats(eyes, face_x, face_y, fw, fh, sw, sh):
+    """Average eye centers (frame coords) and map them to screen coordinates"""
+    n = eyes.shape[0]
+    sum_x = 0.0
+    sum_y = 0.0
+    for i in range(n):
+        sum_x += face_x + eyes[i, 0] + eyes[i, 2] // 2
+        sum_y += face_y + eyes[i, 1] + eyes[i, 3] // 2
+    avg_x = sum_x / n
+    avg_y = sum_y / n
+    return avg_x, avg_y, (avg_x / fw) * sw, (avg_y / fh) * sh
+
 class WebcamEyeTracker:
     """Eye tracking using laptop's built-in webcam with visual feedback"""
 
@@ -184,6 +213,7 @@ class WebcamEyeTracker:
         self.blink_counter = 0
         self.blink_total = 10  # Number of frames to consider for blink detection
         self.last_eyes = None
+        self._last_face_bbox = None  # Face found on the previous frame, used to narrow the search
         self.show_video = True  # Show video feed with tracking visualization
         self.ear_threshold = 0.21  # Eye aspect ratio threshold for blink detection
 
@@ -226,6 +256,11 @@ class WebcamEyeTracker:
             self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
+            # Warm up the JIT so the first tracked frame doesn't pay compile cost
+            eye_stats(np.zeros((1, 4), dtype=np.int32), 0, 0,
+                      self.frame_width, self.frame_height,
+                      self.screen_width, self.screen_height)
+
             # Create window for video display
             if self.show_video:
                 cv2.namedWindow("Eye Tracking", cv2.WINDOW_NORMAL)
@@ -284,8 +319,41 @@ class WebcamEyeTracker:
             # Convert to grayscale
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+            # Detect faces, searching only around last frame's face when we have one
+            faces = ()
+            if self._last_face_bbox is not None:
+                last = self._last_face_bbox
+                lx, ly, lw, lh = last
+                pad = lh // 4
+                # Snap the crop and the scanned size range to a coarse grid. A crop that
+                # followed the last box pixel by pixel shifted the cascade's window grid
+                # every frame, so a still face came back a few px off each time and drifted.
+                g = FACE_TRACK_GRID
+                sx0, sy0 = max(0, lx - pad) // g * g, max(0, ly - pad) // g * g
+                sx1, sy1 = -(-(lx + lw + pad) // g) * g, -(-(ly + lh + pad) // g) * g
+                search = gray[sy0:sy1, sx0:sx1]
+                min_side = int(min(lw, lh) / FACE_TRACK_SCALE) // g * g
+                max_side = -(-int(max(lw, lh) * FACE_TRACK_SCALE) // g) * g
+                found = self.face_cascade.detectMultiScale(
+                    search, FACE_SCALE_FACTOR, 5,
+                    minSize=(min_side, min_side), maxSize=(max_side, max_side))
+                if len(found) > 0:
+                    found[:, 0] += sx0
+                    found[:, 1] += sy0
+                    # Take the detection nearest the last box; if it is within the
+                    # deadband it is detection jitter, so keep reporting the last box
+                    shift = np.abs(found - np.asarray(last)).max(axis=1)
+                    best = int(np.argmin(shift))
+                    if shift[best] <= FACE_TRACK_DEADBAND:
+                        faces = np.array([last], dtype=np.int32)
+                    else:
+                        faces = found[best:best + 1]
+
+            # Fall back to a full-frame search to re-acquire the face
+            if len(faces) == 0:
+                faces = self.face_cascade.detectMultiScale(gray, FACE_SCALE_FACTOR, 5)
+
+            self._last_face_bbox = tuple(int(v) for v in faces[0]) if len(faces) > 0 else None
 
             # Initialize gaze data
             gaze_data = {
@@ -343,11 +411,10 @@ class WebcamEyeTracker:
             if len(eyes) > 0:
                 self.last_eyes = eyes
 
-                # Calculate center of eyes
-                eye_centers = []
-                for ex, ey, ew, eh in eyes:
-                    # Draw orange rectangle around each eye
-                    if self.show_video:
+                # Draw the detected eyes
+                if self.show_video:
+                    for ex, ey, ew, eh in eyes:
+                        # Draw orange rectangle around each eye
                         cv2.rectangle(roi_color, (ex, ey), (ex + ew, ey + eh), (0, 165, 255), 2)
 
                         # Draw points around the eye
@@ -357,13 +424,13 @@ class WebcamEyeTracker:
                             py = int(ey + eh/2 + (eh/2) * 0.8 * np.sin(np.radians(angle)))
                             cv2.circle(roi_color, (px, py), 2, (0, 165, 255), -1)
 
-                    eye_center_x = x + ex + ew // 2
-                    eye_center_y = y + ey + eh // 2
-                    eye_centers.append((eye_center_x, eye_center_y))
-
-                # Average eye center
-                avg_eye_x = sum(e[0] for e in eye_centers) / len(eye_centers)
-                avg_eye_y = sum(e[1] for e in eye_centers) / len(eye_centers)
+                # Average eye center and screen mapping (JIT-compiled when numba is available)
+                # x, y are np.int32 from detectMultiScale; pass plain ints so the call
+                # matches the signature compiled by the warm-up in connect()
+                avg_eye_x, avg_eye_y, screen_x, screen_y = eye_stats(
+                    np.asarray(eyes, dtype=np.int32), int(x), int(y),
+                    self.frame_width, self.frame_height,
+                    self.screen_width, self.screen_height)
 
                 # Draw the gaze point
                 if self.show_video:
@@ -371,10 +438,6 @@ class WebcamEyeTracker:
                     cv2.putText(display_frame, "Gaze", (int(avg_eye_x) + 10, int(avg_eye_y)),
                                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
 
-                # Map to screen coordinates
-                screen_x = (avg_eye_x / self.frame_width) * self.screen_width
-                screen_y = (avg_eye_y / self.frame_height) * self.screen_height
-
                 # Update gaze data
                 gaze_data["x"] = screen_x
                 gaze_data["y"] = screen_y
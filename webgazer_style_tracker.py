@@ -8,11 +8,51 @@ import sys
 import subprocess
 import time
 import signal
+import threading
+import contextlib
+import logging
 import numpy as np
 import random
 from datetime import datetime
+from collections import deque
 import math
 
+try:
+    import cv2
+except ImportError:
+    cv2 = None  # Installed by check_and_install_dependencies and imported in main()
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator used when numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
+# === Configuration ===
+DETECT_SCALE = 2  # Cascades run on frames downscaled by this factor
+DETECT_EVERY = 2  # Run each cascade once every N frames, reusing cached boxes in between
+FACE_LOST_AFTER = 5  # Forget the cached face box after this many face detections in a row miss
+
+# Optional res10 SSD face detector; used instead of the Haar face cascade when present
+DNN_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DNN_FACE_MODEL = os.path.join(DNN_MODEL_DIR, "opencv_face_detector_uint8.pb")
+DNN_FACE_CONFIG = os.path.join(DNN_MODEL_DIR, "opencv_face_detector.pbtxt")
+DNN_CONFIDENCE = 0.5
+
+# Drawing constants. FONT is bound again in main() if cv2 is only importable
+# once dependencies are installed
+FONT = cv2.FONT_HERSHEY_SIMPLEX if cv2 is not None else None
+GREEN = (0, 255, 0)
+WHITE = (255, 255, 255)
+BORDER = (100, 100, 100)
+DARK_BG = (20, 20, 20)
+
 # === Dependency Management ===
 def check_and_install_dependencies():
     """Check and install required dependencies"""
@@ -63,18 +103,23 @@ def fix_webcam_issues():
     # Kill any processes that might be using the webcam
     print("🔍 Checking for processes using the webcam...")
     try:
-        subprocess.run("pkill -f 'zoom' || true", shell=True)
-        subprocess.run("pkill -f 'skype' || true", shell=True)
-        subprocess.run("pkill -f 'teams' || true", shell=True)
-        subprocess.run("pkill -f 'meet' || true", shell=True)
+        # One pkill with an alternation pattern instead of a shell per application
+        subprocess.run(["pkill", "-f", "-e", "zoom|skype|teams|meet"], check=False)
         print("✅ Killed potential processes using the webcam")
     except:
         print("⚠️ Could not kill processes")
 
 # === rEFInd/GRUB Style Button Class ===
+# Hover glow size over one animation cycle (animation_phase 0..2π), shared by all buttons
+_PULSE_STEPS = 64
+_PULSE_LUT = (5 * (1 + 0.3 * np.sin(np.linspace(0, 4 * np.pi, _PULSE_STEPS, endpoint=False)))).astype(np.int32)
+
 class RefindButton:
     """Button with rEFInd/GRUB/Nobara style"""
 
+    # Extra margin around the button for much easier selection
+    HIT_MARGIN = 20
+
     def __init__(self, x, y, width, height, text, action=None, style="refind"):
         self.x = x
         self.y = y
@@ -88,56 +133,62 @@ class RefindButton:
         self.style = style
         self.animation_phase = 0
         self.last_update_time = time.time()
+        self._text_size = None  # Measured on first draw; text and font never change
+        self.static_baked = False  # Idle appearance is pre-rendered into a sprite
 
         # Set style based on requested theme - matching the ChatGPT reference image
         if style == "refind":
             # rEFInd style - dark gray with blue accent
             self.bg_color = (45, 45, 45)  # Dark gray
-            self.border_color = (100, 100, 100)  # Light gray
-            self.text_color = (255, 255, 255)  # White
+            self.border_color = BORDER  # Light gray
+            self.text_color = WHITE
             self.hover_border_color = (59, 130, 246)  # Blue (BGR)
             self.progress_color = (59, 130, 246)  # Blue (BGR)
             self.glow_color = (59, 130, 246)  # Blue (BGR)
         elif style == "grub":
             # GRUB style - dark gray with purple accent
             self.bg_color = (45, 45, 45)  # Dark gray
-            self.border_color = (100, 100, 100)  # Light gray
-            self.text_color = (255, 255, 255)  # White
+            self.border_color = BORDER  # Light gray
+            self.text_color = WHITE
             self.hover_border_color = (139, 92, 246)  # Purple (BGR)
             self.progress_color = (139, 92, 246)  # Purple (BGR)
             self.glow_color = (139, 92, 246)  # Purple (BGR)
         elif style == "nobara":
             # Nobara style - dark gray with red accent
             self.bg_color = (45, 45, 45)  # Dark gray
-            self.border_color = (100, 100, 100)  # Light gray
-            self.text_color = (255, 255, 255)  # White
+            self.border_color = BORDER  # Light gray
+            self.text_color = WHITE
             self.hover_border_color = (79, 70, 229)  # Red (BGR)
             self.progress_color = (79, 70, 229)  # Red (BGR)
             self.glow_color = (79, 70, 229)  # Red (BGR)
         else:
             # Default style
             self.bg_color = (45, 45, 45)  # Dark gray
-            self.border_color = (100, 100, 100)  # Light gray
-            self.text_color = (255, 255, 255)  # White
-            self.hover_border_color = (0, 255, 0)  # Green
-            self.progress_color = (0, 255, 0)  # Green
-            self.glow_color = (0, 255, 0)  # Green
+            self.border_color = BORDER  # Light gray
+            self.text_color = WHITE
+            self.hover_border_color = GREEN
+            self.progress_color = GREEN
+            self.glow_color = GREEN
+
+        # Brighter shade for the leading edge of the progress bar
+        self.highlight_color = tuple(min(255, c + 50) for c in self.progress_color)
 
     def contains_point(self, x, y):
         """Check if a point is inside the button with a larger margin for easier selection"""
-        # Add a larger margin around the button for much easier selection
-        margin = 20
+        margin = self.HIT_MARGIN
         return (
             (self.x - margin) <= x <= (self.x + self.width + margin) and
             (self.y - margin) <= y <= (self.y + self.height + margin)
         )
 
-    def update(self, x, y, dt):
-        """Update button state based on gaze position with improved responsiveness"""
+    def update(self, x, y, dt, now):
+        """Update button state based on gaze position with improved responsiveness
+
+        `now` is the frame timestamp from the main loop, shared by all buttons.
+        """
         # Update animation phase
-        current_time = time.time()
-        dt_real = current_time - self.last_update_time
-        self.last_update_time = current_time
+        dt_real = now - self.last_update_time
+        self.last_update_time = now
         self.animation_phase = (self.animation_phase + dt_real * 2) % (2 * math.pi)
 
         was_hovering = self.hover
@@ -165,12 +216,14 @@ class RefindButton:
 
     def draw(self, frame, font):
         """Draw the button in rEFInd/GRUB/Nobara style with enhanced visual effects"""
-        import cv2
+        # The idle look is already in the baked sprite; only hover state needs drawing
+        if self.static_baked and not self.hover:
+            return
 
         # Draw glow effect when hovering
         if self.hover:
             # Pulsating glow effect
-            glow_size = int(5 * (1 + 0.3 * math.sin(self.animation_phase * 2)))
+            glow_size = int(_PULSE_LUT[int(self.animation_phase * _PULSE_STEPS / (2 * math.pi)) % _PULSE_STEPS])
             # Draw outer glow
             cv2.rectangle(frame,
                          (self.x - glow_size, self.y - glow_size),
@@ -190,9 +243,10 @@ class RefindButton:
                      border_color, border_thickness)
 
         # Draw button text with slight shadow for better visibility
-        text_size = cv2.getTextSize(self.text, font, 0.7, 2)[0]
-        text_x = self.x + (self.width - text_size[0]) // 2
-        text_y = self.y + (self.height + text_size[1]) // 2
+        if self._text_size is None:
+            self._text_size = cv2.getTextSize(self.text, font, 0.7, 2)[0]
+        text_x = self.x + (self.width - self._text_size[0]) // 2
+        text_y = self.y + (self.height + self._text_size[1]) // 2
 
         # Draw text shadow
         cv2.putText(frame, self.text, (text_x+1, text_y+1), font, 0.7,
@@ -217,27 +271,67 @@ class RefindButton:
             # Add highlight to progress bar
             highlight_width = min(5, progress_width)
             if highlight_width > 0:
-                highlight_color = tuple(min(255, c + 50) for c in self.progress_color)
                 cv2.rectangle(frame,
                              (self.x, self.y + self.height - progress_height),
                              (self.x + highlight_width, self.y + self.height - progress_height + 2),
-                             highlight_color, -1)
+                             self.highlight_color, -1)
 
 # === Face Feature Points Generator ===
+@njit(cache=True, fastmath=True)
+def _build_face_points(x, y, w, h, cos_table, sin_table, out):
+    """Fill out (N, 2) with points on the face ellipse (JIT-compiled when numba is available)"""
+    cx = x + w / 2
+    cy = y + h / 2
+    rx = (w / 2) * 0.9
+    ry = (h / 2) * 0.9
+    for i in range(out.shape[0]):
+        out[i, 0] = int(cx + rx * cos_table[i])
+        out[i, 1] = int(cy + ry * sin_table[i])
+    return out
+
 class FaceFeaturePoints:
     """Generate WebGazer-style face feature points with enhanced visual effects"""
 
     def __init__(self):
-        self.face_points = []
-        self.eye_points = []
-        self.eye_centers = []
-        self.mouth_points = []
-        self.nose_points = []
-        self.contour_points = []  # Additional contour points for more detail
+        # Each point group is an (N, 2) int16 array of canvas coordinates; int16 covers
+        # any webcam resolution and halves the bytes touched by blending and drawing.
+        # OpenCV needs int32, so groups are widened only at the draw boundary.
+        self.face_points = np.empty((0, 2), dtype=np.int16)
+        self.eye_points = np.empty((0, 2), dtype=np.int16)
+        self.eye_centers = np.empty((0, 2), dtype=np.int16)
+        self.mouth_points = np.empty((0, 2), dtype=np.int16)
+        self.nose_points = np.empty((0, 2), dtype=np.int16)
+        self.contour_points = np.empty((0, 2), dtype=np.int16)  # Additional contour points for more detail
         self.last_update_time = time.time()
         self.point_stability = 0.9  # Higher value = more stable points (less jitter)
         self.animation_phase = 0  # For animated effects
 
+        # Unit-circle and profile tables; the angles never change, so compute them once.
+        # float32 keeps the per-frame geometry in single precision.
+        ang30 = np.linspace(0, 2 * np.pi, 30, endpoint=False)
+        self._cos30, self._sin30 = np.cos(ang30).astype(np.float32), np.sin(ang30).astype(np.float32)
+        # Eye ring: 12-point outline followed by an 8-point iris, as unit offsets
+        ang12 = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+        ang8 = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+        eye_angles = np.concatenate([ang12, ang8])
+        self._eye_ring = np.stack([np.cos(eye_angles), np.sin(eye_angles)], axis=1).astype(np.float32)
+        self._eye_ring_is_outer = np.arange(20) < 12
+        self._idx10 = np.arange(10)
+        self._idx8 = np.arange(8)
+        self._idx5 = np.arange(5)
+        self._jaw_sin = np.sin(self._idx10 * np.pi / 10).astype(np.float32)
+        self._forehead_sin = np.sin(self._idx8 * np.pi / 8).astype(np.float32)
+        self._t10 = (self._idx10 / 9.0).astype(np.float32)
+        self._mouth_sin = np.sin(self._t10 * np.pi).astype(np.float32)
+        self._t5 = (self._idx5 / 4.0).astype(np.float32)
+        self._ray_angles = self._idx8 * (2 * np.pi / 8)
+
+        # Reused output buffer for the compiled face ring builder; warm the JIT up
+        # here so compilation doesn't stall the first tracked frame
+        self._face_buf = np.empty((30, 2), dtype=np.int16)
+        if NUMBA_AVAILABLE:
+            _build_face_points(0, 0, 1, 1, self._cos30, self._sin30, self._face_buf)
+
     def generate_points(self, x, y, w, h):
         """Generate feature points for a face with improved stability and detail"""
         current_time = time.time()
@@ -248,114 +342,64 @@ class FaceFeaturePoints:
         self.animation_phase = (self.animation_phase + dt * 2) % (2 * math.pi)
 
         # Only regenerate points occasionally to reduce jitter
-        if not self.face_points or random.random() > self.point_stability:
-            # Face boundary points (green) - more points for better detail
-            new_face_points = []
-            for i in range(30):  # Increased from 20 to 30
-                # Points around face boundary
-                angle = i * (2 * np.pi / 30)
-                px = int(x + w/2 + (w/2) * 0.9 * np.cos(angle))
-                py = int(y + h/2 + (h/2) * 0.9 * np.sin(angle))
-                new_face_points.append((px, py))
+        if len(self.face_points) == 0 or random.random() > self.point_stability:
+            # Face boundary points (green) - 30 points around the face ellipse
+            if NUMBA_AVAILABLE:
+                # Plain ints keep the call on the signature compiled by the warm-up
+                # (cascade boxes are np.int32, DNN boxes Python ints)
+                new_face_points = _build_face_points(int(x), int(y), int(w), int(h),
+                                                     self._cos30, self._sin30, self._face_buf)
+            else:
+                new_face_points = np.stack([x + w/2 + (w/2) * 0.9 * self._cos30,
+                                            y + h/2 + (h/2) * 0.9 * self._sin30], axis=1).astype(np.int16)
 
             # Smoothly transition to new points if we already have points
-            if self.face_points:
+            if len(self.face_points):
                 self.face_points = self._smooth_transition(self.face_points, new_face_points, 0.2)
             else:
-                self.face_points = new_face_points
+                # Copy so the stored points never alias the reused build buffer
+                self.face_points = new_face_points.copy()
 
         # Generate additional contour points for more detailed face
-        if not self.contour_points or random.random() > self.point_stability:
-            new_contour_points = []
-
+        if len(self.contour_points) == 0 or random.random() > self.point_stability:
             # Jawline contour
-            jaw_y = y + 3*h//4
-            for i in range(10):
-                jaw_x = x + w//5 + i * w//10
-                jaw_y_offset = int(h/20 * math.sin(i * math.pi / 10))
-                new_contour_points.append((jaw_x, jaw_y + jaw_y_offset))
+            jaw = np.stack([x + w//5 + self._idx10 * w // 10,
+                            y + 3*h//4 + (h/20 * self._jaw_sin).astype(np.int32)], axis=1)
 
             # Forehead contour
-            forehead_y = y + h//6
-            for i in range(8):
-                forehead_x = x + w//4 + i * w//8
-                forehead_y_offset = int(h/30 * math.sin(i * math.pi / 8))
-                new_contour_points.append((forehead_x, forehead_y - forehead_y_offset))
-
-            # Cheek contours
-            left_cheek_x = x + w//5
-            right_cheek_x = x + 4*w//5
-            cheek_y = y + h//2
-
-            for i in range(5):
-                offset_y = i * h//15
-                new_contour_points.append((left_cheek_x, cheek_y + offset_y))
-                new_contour_points.append((right_cheek_x, cheek_y + offset_y))
-
-            if self.contour_points:
+            forehead = np.stack([x + w//4 + self._idx8 * w // 8,
+                                 y + h//6 - (h/30 * self._forehead_sin).astype(np.int32)], axis=1)
+
+            # Cheek contours (left and right interleaved)
+            cheek_y = np.repeat(y + h//2 + self._idx5 * h // 15, 2)
+            cheek_x = np.tile([x + w//5, x + 4*w//5], 5)
+            cheeks = np.stack([cheek_x, cheek_y], axis=1)
+
+            new_contour_points = np.concatenate([jaw, forehead, cheeks]).astype(np.int16)
+
+            if len(self.contour_points):
                 self.contour_points = self._smooth_transition(self.contour_points, new_contour_points, 0.2)
             else:
                 self.contour_points = new_contour_points
 
         # Eye region points (orange/amber for cooler look)
-        if not self.eye_points or random.random() > self.point_stability:
-            new_eye_points = []
-            new_eye_centers = []
-
-            # Left eye
-            left_eye_x = x + w // 4
-            left_eye_y = y + h // 3
-            left_eye_w = w // 5
-            left_eye_h = h // 8
-
-            # Eye center for glow effect
-            left_eye_center = (left_eye_x + left_eye_w//2, left_eye_y + left_eye_h//2)
-            new_eye_centers.append(left_eye_center)
-
-            # Create a more detailed eye pattern
-            for i in range(12):
-                angle = i * (2 * math.pi / 12)
-                radius = min(left_eye_w, left_eye_h) // 2
-                px = int(left_eye_center[0] + radius * math.cos(angle))
-                py = int(left_eye_center[1] + radius * math.sin(angle))
-                new_eye_points.append((px, py))
-
-            # Add some points inside the eye for iris effect
-            for i in range(8):
-                angle = i * (2 * math.pi / 8)
-                radius = min(left_eye_w, left_eye_h) // 4
-                px = int(left_eye_center[0] + radius * math.cos(angle))
-                py = int(left_eye_center[1] + radius * math.sin(angle))
-                new_eye_points.append((px, py))
-
-            # Right eye
-            right_eye_x = x + 3 * w // 4 - w // 5
-            right_eye_y = y + h // 3
-            right_eye_w = w // 5
-            right_eye_h = h // 8
-
-            # Eye center for glow effect
-            right_eye_center = (right_eye_x + right_eye_w//2, right_eye_y + right_eye_h//2)
-            new_eye_centers.append(right_eye_center)
-
-            # Create a more detailed eye pattern
-            for i in range(12):
-                angle = i * (2 * math.pi / 12)
-                radius = min(right_eye_w, right_eye_h) // 2
-                px = int(right_eye_center[0] + radius * math.cos(angle))
-                py = int(right_eye_center[1] + radius * math.sin(angle))
-                new_eye_points.append((px, py))
-
-            # Add some points inside the eye for iris effect
-            for i in range(8):
-                angle = i * (2 * math.pi / 8)
-                radius = min(right_eye_w, right_eye_h) // 4
-                px = int(right_eye_center[0] + radius * math.cos(angle))
-                py = int(right_eye_center[1] + radius * math.sin(angle))
-                new_eye_points.append((px, py))
+        if len(self.eye_points) == 0 or random.random() > self.point_stability:
+            eye_w = w // 5
+            eye_h = h // 8
+            eye_y = y + h // 3
+
+            # Left and right eye centers for the glow effect
+            left_eye_center = (x + w // 4 + eye_w//2, eye_y + eye_h//2)
+            right_eye_center = (x + 3 * w // 4 - w // 5 + eye_w//2, eye_y + eye_h//2)
+            new_eye_centers = np.array([left_eye_center, right_eye_center], dtype=np.int16)
+
+            # Both eyes' outline and iris rings in one broadcast: (2 eyes, 20 points, xy)
+            eye_radius = min(eye_w, eye_h)
+            ring = self._eye_ring * np.where(self._eye_ring_is_outer, eye_radius // 2, eye_radius // 4)[:, None]
+            new_eye_points = (new_eye_centers[:, None, :] + ring).reshape(-1, 2).astype(np.int16)
 
             # Smoothly transition to new points if we already have points
-            if self.eye_points:
+            if len(self.eye_points):
                 self.eye_points = self._smooth_transition(self.eye_points, new_eye_points, 0.2)
                 self.eye_centers = self._smooth_transition(self.eye_centers, new_eye_centers, 0.2)
             else:
@@ -363,65 +407,53 @@ class FaceFeaturePoints:
                 self.eye_centers = new_eye_centers
 
         # Nose points (yellow)
-        if not self.nose_points or random.random() > self.point_stability:
-            new_nose_points = []
+        if len(self.nose_points) == 0 or random.random() > self.point_stability:
             nose_x = x + w // 2 - w // 10
             nose_y = y + h // 2
             nose_w = w // 5
             nose_h = h // 6
 
-            # Create a more detailed nose pattern
             # Bridge of nose
-            for i in range(5):
-                px = x + w//2
-                py = y + h//3 + i * h//20
-                new_nose_points.append((px, py))
+            bridge = np.stack([np.full(5, x + w//2), y + h//3 + self._idx5 * h // 20], axis=1)
 
             # Nostrils and tip
             nostril_y = nose_y + nose_h//2
-            new_nose_points.append((nose_x, nostril_y))
-            new_nose_points.append((nose_x + nose_w, nostril_y))
-            new_nose_points.append((x + w//2, nose_y + nose_h//3))  # Tip
-
-            # Nose outline
-            for i in range(5):
-                t = i / 4.0
-                px = int(nose_x + t * nose_w)
-                py = int(nose_y + t * nose_h//2)
-                new_nose_points.append((px, py))
-                new_nose_points.append((nose_x + nose_w - (px - nose_x), py))
+            tip = np.array([[nose_x, nostril_y],
+                            [nose_x + nose_w, nostril_y],
+                            [x + w//2, nose_y + nose_h//3]])
+
+            # Nose outline, each point followed by its mirror image
+            outline_x = (nose_x + self._t5 * nose_w).astype(np.int32)
+            outline_y = (nose_y + self._t5 * nose_h // 2).astype(np.int32)
+            outline = np.stack([np.stack([outline_x, outline_y], axis=1),
+                                np.stack([nose_x + nose_w - (outline_x - nose_x), outline_y], axis=1)],
+                               axis=1).reshape(-1, 2)
+
+            new_nose_points = np.concatenate([bridge, tip, outline]).astype(np.int16)
 
             # Smoothly transition to new points if we already have points
-            if self.nose_points:
+            if len(self.nose_points):
                 self.nose_points = self._smooth_transition(self.nose_points, new_nose_points, 0.2)
             else:
                 self.nose_points = new_nose_points
 
         # Mouth points (magenta)
-        if not self.mouth_points or random.random() > self.point_stability:
-            new_mouth_points = []
+        if len(self.mouth_points) == 0 or random.random() > self.point_stability:
             mouth_x = x + w // 3
             mouth_y = y + 2 * h // 3
             mouth_w = w // 3
             mouth_h = h // 10
 
-            # Create a more detailed mouth pattern
-            # Upper lip
-            for i in range(10):
-                t = i / 9.0
-                px = int(mouth_x + t * mouth_w)
-                py = int(mouth_y - mouth_h//4 * math.sin(t * math.pi))
-                new_mouth_points.append((px, py))
-
-            # Lower lip
-            for i in range(10):
-                t = i / 9.0
-                px = int(mouth_x + mouth_w - t * mouth_w)
-                py = int(mouth_y + mouth_h//2 + mouth_h//4 * math.sin(t * math.pi))
-                new_mouth_points.append((px, py))
+            # Upper lip left to right, then lower lip right to left
+            upper = np.stack([mouth_x + self._t10 * mouth_w,
+                              mouth_y - mouth_h//4 * self._mouth_sin], axis=1)
+            lower = np.stack([mouth_x + mouth_w - self._t10 * mouth_w,
+                              mouth_y + mouth_h//2 + mouth_h//4 * self._mouth_sin], axis=1)
+
+            new_mouth_points = np.concatenate([upper, lower]).astype(np.int16)
 
             # Smoothly transition to new points if we already have points
-            if self.mouth_points:
+            if len(self.mouth_points):
                 self.mouth_points = self._smooth_transition(self.mouth_points, new_mouth_points, 0.2)
             else:
                 self.mouth_points = new_mouth_points
@@ -429,40 +461,29 @@ class FaceFeaturePoints:
     def _smooth_transition(self, old_points, new_points, blend_factor):
         """Blend between old and new points to reduce jitter"""
         # If point counts don't match, just use new points
-        if len(old_points) != len(new_points):
+        if old_points.shape != new_points.shape:
             return new_points
 
-        blended_points = []
-        for i in range(len(old_points)):
-            old_x, old_y = old_points[i]
-            new_x, new_y = new_points[i]
-
-            # Blend coordinates
-            blended_x = int(old_x * (1 - blend_factor) + new_x * blend_factor)
-            blended_y = int(old_y * (1 - blend_factor) + new_y * blend_factor)
-
-            blended_points.append((blended_x, blended_y))
-
-        return blended_points
+        return (old_points * (1 - blend_factor) + new_points * blend_factor).astype(np.int16)
 
     def draw_points(self, frame):
         """Draw feature points on the frame with enhanced visual effects"""
-        import cv2
-
-        # Draw face boundary points (green)
-        for px, py in self.face_points:
-            cv2.circle(frame, (px, py), 2, (0, 255, 0), -1)
-
-        # Draw contour points (blue-green)
-        for px, py in self.contour_points:
-            cv2.circle(frame, (px, py), 2, (100, 255, 100), -1)
-
-        # Draw eye points (orange/amber for cooler look)
-        for px, py in self.eye_points:
-            cv2.circle(frame, (px, py), 2, (0, 165, 255), -1)  # Orange in BGR
+        # Each landmark group is drawn in one call: every point becomes its own
+        # one-point closed polyline, which OpenCV renders as a round dot of
+        # diameter `thickness`
+        dot_groups = (
+            (self.face_points, GREEN),              # Face boundary points (green)
+            (self.contour_points, (100, 255, 100)), # Contour points (blue-green)
+            (self.eye_points, (0, 165, 255)),       # Eye points (orange in BGR)
+            (self.nose_points, (0, 255, 255)),      # Nose points (yellow)
+            (self.mouth_points, (255, 0, 255)),     # Mouth points (magenta)
+        )
+        for points, color in dot_groups:
+            if len(points):
+                cv2.polylines(frame, points.astype(np.int32).reshape(-1, 1, 1, 2), True, color, 4)
 
         # Draw eye centers with glowing effect
-        for cx, cy in self.eye_centers:
+        for cx, cy in self.eye_centers.tolist():
             # Pulsating glow effect
             glow_size = 5 + int(3 * math.sin(self.animation_phase))
             # Outer glow (darker orange)
@@ -470,39 +491,104 @@ class FaceFeaturePoints:
             # Inner glow (bright orange)
             cv2.circle(frame, (cx, cy), glow_size, (0, 200, 255), -1)
             # Center (white)
-            cv2.circle(frame, (cx, cy), 2, (255, 255, 255), -1)
-
-        # Draw nose points (yellow)
-        for px, py in self.nose_points:
-            cv2.circle(frame, (px, py), 2, (0, 255, 255), -1)
-
-        # Draw mouth points (magenta)
-        for px, py in self.mouth_points:
-            cv2.circle(frame, (px, py), 2, (255, 0, 255), -1)
+            cv2.circle(frame, (cx, cy), 2, WHITE, -1)
 
         # Connect points to create more defined features
         if len(self.face_points) > 2:
             # Connect face boundary points
-            for i in range(len(self.face_points)):
-                cv2.line(frame, self.face_points[i], self.face_points[(i+1) % len(self.face_points)], (0, 200, 0), 1)
+            cv2.polylines(frame, [self.face_points.astype(np.int32).reshape(-1, 1, 2)], True, (0, 200, 0), 1)
 
         if len(self.mouth_points) > 2:
             # Connect mouth points
-            for i in range(len(self.mouth_points) - 1):
-                cv2.line(frame, self.mouth_points[i], self.mouth_points[i+1], (200, 0, 200), 1)
+            cv2.polylines(frame, [self.mouth_points.astype(np.int32).reshape(-1, 1, 2)], False, (200, 0, 200), 1)
 
         # Add some dynamic elements based on animation phase
         # Pulsating effect for some points
         pulse_size = 1 + int(1.5 * math.sin(self.animation_phase))
-        if self.eye_centers:
-            for cx, cy in self.eye_centers:
-                # Draw rays emanating from eyes
-                for i in range(8):
-                    angle = i * (2 * math.pi / 8) + self.animation_phase / 2
-                    ray_length = 10 + int(5 * math.sin(self.animation_phase + i))
-                    end_x = int(cx + ray_length * math.cos(angle))
-                    end_y = int(cy + ray_length * math.sin(angle))
-                    cv2.line(frame, (cx, cy), (end_x, end_y), (0, 128 + pulse_size*20, 255), 1)
+        if len(self.eye_centers):
+            # Draw rays emanating from eyes, all as two-point segments in one call
+            angles = self._ray_angles + self.animation_phase / 2
+            ray_length = 10 + (5 * np.sin(self.animation_phase + self._idx8)).astype(np.int32)
+            ray_offsets = np.stack([ray_length * np.cos(angles), ray_length * np.sin(angles)], axis=1)
+            centers = self.eye_centers
+            ends = (centers[:, None, :] + ray_offsets[None, :, :]).astype(np.int32)
+            starts = np.broadcast_to(centers[:, None, :], ends.shape)
+            rays = np.stack([starts, ends], axis=2).reshape(-1, 2, 2)
+            cv2.polylines(frame, rays, False, (0, 128 + pulse_size*20, 255), 1)
+
+# === DNN Face Detection ===
+def detect_faces_dnn(net, frame):
+    """Detect faces with the SSD network, returning (x, y, w, h) boxes best-first"""
+    frame_h, frame_w = frame.shape[:2]
+    blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), (104, 177, 123))
+    net.setInput(blob)
+    detections = net.forward()[0, 0]
+
+    # Rows are [_, _, confidence, x1, y1, x2, y2] with normalized coordinates
+    detections = detections[detections[:, 2] > DNN_CONFIDENCE]
+    boxes = (detections[:, 3:7] * (frame_w, frame_h, frame_w, frame_h)).astype(np.int32)
+    boxes[:, 0::2] = boxes[:, 0::2].clip(0, frame_w - 1)
+    boxes[:, 1::2] = boxes[:, 1::2].clip(0, frame_h - 1)
+
+    return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes.tolist()
+            if x2 > x1 and y2 > y1]
+
+# === Eye Detection ===
+def detect_eyes_in_face(eye_cascade, small_gray, frame, face):
+    """Detect eyes inside a face box, returning (K, 4) int32 boxes relative to the face
+
+    The search runs on the face's patch of the downscaled frame while its eyes still
+    cover the cascade's training window there; smaller faces are searched at full
+    resolution so their eyes are not scaled below the smallest size the cascade scans.
+    """
+    x, y, w, h = face
+    win_w, win_h = eye_cascade.getOriginalWindowSize()
+
+    # Eye size is bounded by the face box, which limits the scales scanned
+    max_w, max_h = w // 3, h // 5
+    if max_w // DETECT_SCALE >= win_w and max_h // DETECT_SCALE >= win_h:
+        scale = DETECT_SCALE
+        roi_gray = small_gray[y // scale:(y + h) // scale, x // scale:(x + w) // scale]
+    else:
+        scale = 1
+        roi_gray = cv2.cvtColor(frame[y:y + h, x:x + w], cv2.COLOR_BGR2GRAY)
+
+    eyes = eye_cascade.detectMultiScale(
+        cv2.equalizeHist(roi_gray),
+        scaleFactor=1.2,
+        minNeighbors=3,
+        minSize=(w // 8 // scale, h // 12 // scale),
+        maxSize=(max(max_w // scale, win_w), max(max_h // scale, win_h)),
+        flags=cv2.CASCADE_DO_CANNY_PRUNING
+    )
+    # Empty tuple when nothing is found; scale boxes back to full resolution
+    return np.asarray(eyes, dtype=np.int32).reshape(-1, 4) * scale
+
+# === Drawing Helpers ===
+def build_trail_arrays(n, base_size, size_range, max_intensity):
+    """Dot size and green intensity for each point of an n-point gaze trail, oldest first"""
+    alpha = np.arange(1, n + 1) / n
+    sizes = (base_size + size_range * alpha).astype(np.int32)
+    intensities = (max_intensity * alpha).astype(np.int32)
+    return sizes, intensities
+
+def build_disc_stencils(min_radius, max_radius):
+    """Boolean filled-circle masks keyed by radius, rasterized once by cv2.circle"""
+    return {
+        r: cv2.circle(np.zeros((2 * r + 1, 2 * r + 1), dtype=np.uint8), (r, r), r, 1, -1).astype(bool)
+        for r in range(min_radius, max_radius + 1)
+    }
+
+def stamp_disc(image, cx, cy, stencil, color):
+    """Fill a precomputed disc stencil centered at (cx, cy), clipped to the image"""
+    r = stencil.shape[0] // 2
+    height, width = image.shape[:2]
+    x0, y0 = max(cx - r, 0), max(cy - r, 0)
+    x1, y1 = min(cx + r + 1, width), min(cy + r + 1, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    sx, sy = x0 - (cx - r), y0 - (cy - r)
+    image[y0:y1, x0:x1][stencil[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]] = color
 
 # === Main Function ===
 def main():
@@ -515,13 +601,20 @@ def main():
     # Fix webcam issues
     fix_webcam_issues()
 
-    # Import dependencies after they've been installed
+    # Import dependencies after they've been installed; binds the module-level
+    # names used by RefindButton, FaceFeaturePoints and the drawing code
+    global cv2, FONT
     import cv2
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+    # Resources are released exactly once, in reverse order, whichever way main exits
+    cleanup = contextlib.ExitStack()
 
     try:
         # Initialize webcam
         print("🔌 Connecting to webcam...")
         cap = cv2.VideoCapture(0)
+        cleanup.callback(cap.release)
 
         if not cap.isOpened():
             print("❌ Failed to open webcam")
@@ -531,14 +624,27 @@ def main():
             print("   - Insufficient permissions")
             return
 
+        # Request compressed MJPG at 30 fps; raw YUYV at 640x480 saturates USB 2.0
+        # on many webcams and caps the frame rate well below 30 fps
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_FPS, 30)
+
         # Set resolution
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
 
+        # Keep the driver queue to a single frame so reads never return stale images
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        buffer_size = cap.get(cv2.CAP_PROP_BUFFERSIZE)
+        if buffer_size != 1:
+            print(f"⚠️ Capture backend ignored buffer size 1 (reports {buffer_size:g}); frames may lag")
+
         # Get actual resolution
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        print(f"✅ Connected to webcam ({frame_width}x{frame_height})")
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fourcc_str = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        print(f"✅ Connected to webcam ({frame_width}x{frame_height}, {fourcc_str})")
 
         # Load face and eye cascades
         cv_path = cv2.__path__[0]
@@ -564,10 +670,37 @@ def main():
             print("❌ Failed to load eye cascade")
             return
 
-        # Create window
-        cv2.namedWindow("WebGazer Style Tracker", cv2.WINDOW_NORMAL)
+        # Prefer the DNN face detector when its model files have been downloaded
+        face_net = None
+        if os.path.exists(DNN_FACE_MODEL) and os.path.exists(DNN_FACE_CONFIG):
+            face_net = cv2.dnn.readNetFromTensorflow(DNN_FACE_MODEL, DNN_FACE_CONFIG)
+            face_net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            face_net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            print("✅ Using DNN face detector")
+        else:
+            print(f"ℹ️ DNN face model not found in {DNN_MODEL_DIR}, using Haar face cascade")
+
+        # Create window. With an OpenGL-enabled OpenCV build, imshow uploads the canvas
+        # into a GL texture instead of going through the toolkit's CPU blit; other
+        # builds reject WINDOW_OPENGL, so fall back to a plain window
+        try:
+            cv2.namedWindow("WebGazer Style Tracker", cv2.WINDOW_NORMAL | cv2.WINDOW_OPENGL)
+            use_opengl = True
+        except cv2.error:
+            cv2.namedWindow("WebGazer Style Tracker", cv2.WINDOW_NORMAL)
+            use_opengl = False
+        cleanup.callback(cv2.destroyAllWindows)
         cv2.resizeWindow("WebGazer Style Tracker", frame_width, frame_height)
 
+        # Offload resize, color conversion and the face cascade to the GPU via OpenCL when available
+        use_opencl = cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(use_opencl)
+        print(f"🖥️ OpenCL acceleration: {'enabled' if use_opencl else 'not available'}")
+        print(f"🖥️ OpenGL display: {'enabled' if use_opengl else 'not available'}")
+
+        # pollKey() needs OpenCV >= 4.5; older builds fall back to waitKey(1) every few frames
+        has_poll_key = hasattr(cv2, "pollKey")
+
         print("✅ Webcam initialized")
         print("👁️ Looking for face and eyes...")
         print("Press ESC to exit")
@@ -575,9 +708,13 @@ def main():
         # Initialize variables for tracking
         last_face = None
         last_eyes = []
+        tracked_faces = []
+        missed_detections = 0
+        frame_idx = 0
+        shown_state = None  # UI state of the last frame sent to imshow
         last_time = time.time()
-        gaze_history = []
         max_gaze_history = 20  # Number of gaze points to keep in history
+        gaze_history = deque(maxlen=max_gaze_history)  # Oldest points drop off automatically
 
         # Initialize face feature points
         face_features = FaceFeaturePoints()
@@ -667,6 +804,17 @@ def main():
         )
         buttons.append(exit_button)
 
+        # Calibration panel buttons, split from the exit button once by identity
+        panel_buttons = tuple(button for button in buttons if button is not exit_button)
+
+        # Button hit boxes (x1, y1, x2, y2 including the selection margin) for
+        # vectorized hit-testing, exit button first; built once as buttons never move
+        hit_buttons = (exit_button,) + panel_buttons
+        hit_boxes = np.array([[b.x - b.HIT_MARGIN, b.y - b.HIT_MARGIN,
+                               b.x + b.width + b.HIT_MARGIN, b.y + b.height + b.HIT_MARGIN]
+                              for b in hit_buttons], dtype=np.int32)
+        hit_hover = np.zeros(len(hit_buttons), dtype=bool)
+
         # Main loop
         running = True
         show_calibration = True
@@ -675,89 +823,270 @@ def main():
         # Create a black canvas for digital twin
         digital_twin = np.zeros((canvas_height, canvas_width, 3), dtype=np.uint8)
 
+        # Render the calibration panel and its idle buttons once into a sprite;
+        # each frame blits it and only hovered buttons are drawn on top
+
+        # Draw panel background
+        cv2.rectangle(digital_twin,
+                     (panel_x, panel_y),
+                     (panel_x + panel_width, panel_y + panel_height),
+                     DARK_BG, -1)  # Darker background
+
+        # Draw panel border
+        cv2.rectangle(digital_twin,
+                     (panel_x, panel_y),
+                     (panel_x + panel_width, panel_y + panel_height),
+                     BORDER, 1)  # Subtle gray border
+
+        # Draw panel title
+        cv2.putText(digital_twin, "Calibration Options",
+                   (panel_x + 50, panel_y + 50),
+                   FONT, 1.0, WHITE, 2)
+
+        for button in panel_buttons:
+            button.draw(digital_twin, FONT)
+            button.static_baked = True
+
+        panel_region = (slice(panel_y, panel_y + panel_height + 1),
+                        slice(panel_x, panel_x + panel_width + 1))
+        panel_sprite = digital_twin[panel_region].copy()
+        digital_twin.fill(0)
+
+        # Status messages at the bottom never change either: render each variant once
+        # into a strip layer with a mask of its text pixels, and composite per frame
+        font_scale = 0.6
+        font_thickness = 1
+        status_top = canvas_height - 80
+
+        def render_status_layer(lines):
+            layer = np.zeros((canvas_height - status_top, canvas_width, 3), dtype=np.uint8)
+            for text, text_y in lines:
+                cv2.putText(layer, text, (10, text_y - status_top),
+                           FONT, font_scale, GREEN, font_thickness)
+            return layer, layer.any(axis=2)[..., None]
+
+        status_loaded = ("✓ WebGazer loaded.", canvas_height - 60)
+        status_calibrating = render_status_layer([status_loaded])
+        status_calibrated = render_status_layer([
+            status_loaded,
+            ("✓ Calibration box closed.", canvas_height - 40),
+            ("✓ Mode 1 selected.", canvas_height - 20),
+        ])
+
+        # Gaze trail: disc stencils for every radius the trail uses, and per-length
+        # tables of each point's size and intensity (they only depend on its recency)
+        trail_stencils = build_disc_stencils(4, 14)
+        trail_tables = {}
+        for trail_len in range(1, max_gaze_history + 1):
+            sizes, intensities = build_trail_arrays(trail_len, 4, 8, 255)
+            trail_tables[trail_len] = list(zip(sizes.tolist(), intensities.tolist()))
+
+        # Crosshair strokes around the origin, shifted to the gaze point when drawn
+        line_length = 10
+        crosshair = np.array([[[-line_length, 0], [line_length, 0]],
+                              [[0, -line_length], [0, line_length]]], dtype=np.int32)
+        crosshair_pts = np.empty_like(crosshair)  # polylines needs int32 points
+
+        def draw_gaze(canvas, gaze_x, gaze_y):
+            # Draw gaze history as fading trail, size and opacity based on recency
+            for (hx, hy), (size, color_intensity) in zip(gaze_history, trail_tables[len(gaze_history)]):
+                # Draw glow effect for trail
+                stamp_disc(canvas, hx, hy, trail_stencils[size + 2], (0, color_intensity//2, 0))
+                stamp_disc(canvas, hx, hy, trail_stencils[size], (0, color_intensity, 0))
+
+            # Draw current gaze point with enhanced visibility
+            # Outer glow
+            cv2.circle(canvas, (gaze_x, gaze_y), 16, (0, 100, 0), -1)
+            # Middle glow
+            cv2.circle(canvas, (gaze_x, gaze_y), 12, (0, 180, 0), -1)
+            # Inner bright point
+            cv2.circle(canvas, (gaze_x, gaze_y), 6, GREEN, -1)
+
+            # Draw crosshair for precise targeting: both strokes in one call
+            np.add(crosshair, (gaze_x, gaze_y), out=crosshair_pts)
+            cv2.polylines(canvas, crosshair_pts, False, GREEN, 1)
+
+        def draw_calibration_panel(canvas):
+            # Idle buttons are already part of the panel sprite
+            canvas[panel_region] = panel_sprite
+            for button in panel_buttons:
+                button.draw(canvas, FONT)
+
+        # Per-state overlay renderers, picked once per frame by
+        # (show_calibration, gaze_detected) so each one draws straight through
+        def render_calibration_gaze(canvas, gaze_x, gaze_y):
+            draw_calibration_panel(canvas)
+            exit_button.draw(canvas, FONT)
+            draw_gaze(canvas, gaze_x, gaze_y)
+            np.copyto(canvas[status_top:], status_calibrating[0], where=status_calibrating[1])
+
+        def render_calibration_no_gaze(canvas, gaze_x, gaze_y):
+            draw_calibration_panel(canvas)
+            exit_button.draw(canvas, FONT)
+            np.copyto(canvas[status_top:], status_calibrating[0], where=status_calibrating[1])
+
+        def render_tracking_gaze(canvas, gaze_x, gaze_y):
+            exit_button.draw(canvas, FONT)
+            draw_gaze(canvas, gaze_x, gaze_y)
+            np.copyto(canvas[status_top:], status_calibrated[0], where=status_calibrated[1])
+
+        def render_tracking_no_gaze(canvas, gaze_x, gaze_y):
+            exit_button.draw(canvas, FONT)
+            np.copyto(canvas[status_top:], status_calibrated[0], where=status_calibrated[1])
+
+        render_fns = {
+            (True, True): render_calibration_gaze,
+            (True, False): render_calibration_no_gaze,
+            (False, True): render_tracking_gaze,
+            (False, False): render_tracking_no_gaze,
+        }
+
         # Smoothed gaze position
         smoothed_gaze_x = canvas_width // 2
         smoothed_gaze_y = canvas_height // 2
         gaze_smoothing = 0.8  # Higher = more smoothing
 
-        while running:
-            # Capture frame
-            ret, frame = cap.read()
+        # Capture on a background thread into a two-slot ring of preallocated frames:
+        # the thread decodes into the write slot and swaps it with the read slot, so
+        # only an index crosses threads and no frame is copied or allocated. The render
+        # loop sets want_frame when it is ready for a new frame, and the thread decodes
+        # the next frame it grabs after that, so every processed frame is at most one
+        # camera frame old. By then the loop is done with the frame it had, so the slot
+        # being written is never the one being rendered. pending_time holds the capture
+        # timestamp of the unread frame and frame_ready wakes the render loop.
+        frame_slots = [np.empty((frame_height, frame_width, 3), dtype=np.uint8) for _ in range(2)]
+        write_idx, read_idx = 0, 1
+        pending_time = None
+        frame_lock = threading.Lock()
+        want_frame = threading.Event()
+        frame_ready = threading.Event()
+        capture_failed = threading.Event()
+
+        def grab_frames():
+            nonlocal write_idx, read_idx, pending_time
+            while running:
+                # grab() keeps the stream current without decoding; frames grabbed
+                # while the render loop is busy are dropped without being decoded
+                if not cap.grab():
+                    capture_failed.set()
+                    frame_ready.set()
+                    break
+                frame_time = time.time()
+                if want_frame.is_set():
+                    want_frame.clear()
+                    ok, f = cap.retrieve(frame_slots[write_idx])
+                    if ok:
+                        frame_slots[write_idx] = f  # Same array unless the stream size changed
+                        with frame_lock:
+                            write_idx, read_idx = read_idx, write_idx
+                            pending_time = frame_time
+                            frame_ready.set()
+                    else:
+                        want_frame.set()  # Still owed a frame; decode the next grab
+
+        def stop_capture():
+            nonlocal running
+            running = False
+            grab_thread.join(timeout=1.0)
 
-            if not ret:
-                print("❌ Failed to capture frame")
-                break
+        grab_thread = threading.Thread(target=grab_frames, daemon=True)
+        grab_thread.start()
+        cleanup.callback(stop_capture)
 
-            # Create a black canvas for this frame
-            digital_twin = np.zeros((canvas_height, canvas_width, 3), dtype=np.uint8)
+        while running:
+            # Ask for a frame only now, so the capture thread decodes the next one it
+            # grabs instead of one that would have waited through the last iteration,
+            # then wait for it to be published
+            with frame_lock:
+                if pending_time is None:
+                    want_frame.set()
+            frame_ready.wait(timeout=0.1)
+            with frame_lock:
+                frame_time = pending_time
+                pending_time = None
+                frame = frame_slots[read_idx]
+                frame_ready.clear()
+
+            if frame_time is None:
+                if capture_failed.is_set():
+                    print("❌ Failed to capture frame")
+                    break
+                continue
 
-            # Calculate time delta
-            current_time = time.time()
+            # Calculate time delta from the capture timestamps
+            current_time = frame_time
             dt = current_time - last_time
             last_time = current_time
 
-            # Convert to grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            # Downscale and convert to grayscale for detection; cascade cost scales
+            # with pixel count, so detections run at reduced size and are scaled back up
+            src = cv2.UMat(frame) if use_opencl else frame
+            small = cv2.resize(src, (0, 0), fx=1 / DETECT_SCALE, fy=1 / DETECT_SCALE,
+                               interpolation=cv2.INTER_AREA)
+            usmall_gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+            small_gray = usmall_gray.get() if use_opencl else usmall_gray  # ndarray for ROI slicing
 
             # Initialize gaze position
             gaze_x = canvas_width // 2
             gaze_y = canvas_height // 2
             gaze_detected = False
 
+            # Face and eye detection each run once every DETECT_EVERY frames, on
+            # staggered frames so their cost never lands on the same tick
+            frame_idx += 1
+            detect_phase = frame_idx % DETECT_EVERY
+            detect_faces = detect_phase == 0
+            detect_eyes = detect_phase == (1 if DETECT_EVERY > 1 else 0)
+
             # Detect faces
-            faces = face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,  # Lower scale factor for better detection
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-
-            if len(faces) > 0:
-                last_face = faces[0]
-                # Generate face feature points
-                x, y, w, h = faces[0]
+            if detect_faces:
+                if face_net is not None:
+                    faces = detect_faces_dnn(face_net, frame)
+                else:
+                    faces = face_cascade.detectMultiScale(
+                        usmall_gray,
+                        scaleFactor=1.2,  # Coarser pyramid; webcam faces are large enough
+                        minNeighbors=5,
+                        minSize=(15, 15),
+                        flags=cv2.CASCADE_DO_CANNY_PRUNING
+                    )
+                    faces = [tuple(DETECT_SCALE * v for v in face) for face in faces]
+
+                if len(faces) > 0:
+                    last_face = faces[0]
+                    tracked_faces = faces
+                    missed_detections = 0
+                elif last_face is not None:
+                    missed_detections += 1
+                    if missed_detections >= FACE_LOST_AFTER:
+                        # Face has left the view: stop tracking the stale box
+                        last_face = None
+                        last_eyes = []
+                        tracked_faces = []
+                    else:
+                        # Use last known face if no face detected
+                        tracked_faces = [last_face]
+            faces = tracked_faces
+
+            # Feature points animate every frame from the cached face box
+            if last_face is not None:
+                x, y, w, h = last_face
                 face_features.generate_points(x, y, w, h)
-            elif last_face is not None:
-                # Use last known face if no face detected
-                faces = [last_face]
 
             # Process detected faces
             for (x, y, w, h) in faces:
-                # Draw red rectangle around face on digital twin
-                cv2.rectangle(digital_twin, (x, y), (x + w, y + h), (0, 0, 255), 2)
-
-                # Draw WebGazer-style feature points on digital twin
-                face_features.draw_points(digital_twin)
-
-                # Extract face ROI
-                roi_gray = gray[y:y+h, x:x+w]
+                # Detect eyes, otherwise reuse the last known eyes
+                eyes = last_eyes
+                if detect_eyes:
+                    detected_eyes = detect_eyes_in_face(eye_cascade, small_gray, frame, (x, y, w, h))
 
-                # Detect eyes
-                eyes = eye_cascade.detectMultiScale(
-                    roi_gray,
-                    scaleFactor=1.1,
-                    minNeighbors=3,
-                    minSize=(20, 20)
-                )
-
-                if len(eyes) > 0:
-                    last_eyes = eyes
-                elif len(last_eyes) > 0:
-                    # Use last known eyes if no eyes detected
-                    eyes = last_eyes
-
-                # Process detected eyes
-                eye_centers = []
-                for (ex, ey, ew, eh) in eyes:
-                    # Calculate eye center
-                    eye_center_x = x + ex + ew // 2
-                    eye_center_y = y + ey + eh // 2
-                    eye_centers.append((eye_center_x, eye_center_y))
+                    if len(detected_eyes) > 0:
+                        last_eyes = eyes = detected_eyes
 
                 # Calculate gaze position (average of eye centers)
-                if eye_centers:
-                    raw_gaze_x = sum(e[0] for e in eye_centers) / len(eye_centers)
-                    raw_gaze_y = sum(e[1] for e in eye_centers) / len(eye_centers)
+                if len(eyes) > 0:
+                    eye_centers = eyes[:, :2] + eyes[:, 2:] // 2 + (x, y)
+                    raw_gaze_x, raw_gaze_y = eye_centers.mean(axis=0)
 
                     # Apply smoothing to gaze position
                     smoothed_gaze_x = smoothed_gaze_x * gaze_smoothing + raw_gaze_x * (1 - gaze_smoothing)
@@ -769,125 +1098,77 @@ def main():
 
                     # Add to gaze history
                     gaze_history.append((gaze_x, gaze_y))
-                    if len(gaze_history) > max_gaze_history:
-                        gaze_history.pop(0)
-
-            # Draw calibration panel matching the ChatGPT reference image
-            if show_calibration:
-                # Draw panel background
-                cv2.rectangle(digital_twin,
-                             (panel_x, panel_y),
-                             (panel_x + panel_width, panel_y + panel_height),
-                             (20, 20, 20), -1)  # Darker background
-
-                # Draw panel border
-                cv2.rectangle(digital_twin,
-                             (panel_x, panel_y),
-                             (panel_x + panel_width, panel_y + panel_height),
-                             (100, 100, 100), 1)  # Subtle gray border
-
-                # Draw panel title
-                cv2.putText(digital_twin, "Calibration Options",
-                           (panel_x + 50, panel_y + 50),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
-
-            # Update buttons with smoothed gaze position
-            # Process exit button first for better responsiveness
-            if exit_button.update(gaze_x, gaze_y, dt):
-                # Exit button was activated
-                print("✅ Exit button activated")
-                break
 
-            # Process other buttons
-            for button in buttons:
-                if button != exit_button and button.update(gaze_x, gaze_y, dt):
-                    # Button was activated
-                    if button == mode1_button or button == mode2_button or button == mode3_button:
-                        show_calibration = False
-                        print("✅ Calibration box closed.")
+            # Update buttons with smoothed gaze position: hit-test all boxes at once and
+            # only update buttons under the gaze or still hovered from the last frame
+            # (they need their dwell reset). Exit button comes first for responsiveness.
+            hits = ((hit_boxes[:, 0] <= gaze_x) & (gaze_x <= hit_boxes[:, 2]) &
+                    (hit_boxes[:, 1] <= gaze_y) & (gaze_y <= hit_boxes[:, 3]))
+            activated = None
+            for i in np.flatnonzero(hits | hit_hover).tolist():
+                button = hit_buttons[i]
+                fired = button.update(gaze_x, gaze_y, dt, current_time)
+                hit_hover[i] = button.hover
+                if fired:
+                    activated = button
                     break
 
-            # Draw buttons
-            if show_calibration:
-                for button in buttons:
-                    if button != exit_button:
-                        button.draw(digital_twin, cv2.FONT_HERSHEY_SIMPLEX)
-
-            # Always draw exit button
-            exit_button.draw(digital_twin, cv2.FONT_HERSHEY_SIMPLEX)
-
-            # Draw gaze trail if detected
-            if gaze_detected and gaze_history:
-                # Draw gaze history as fading trail
-                for i, (hx, hy) in enumerate(gaze_history):
-                    # Size and opacity based on recency
-                    alpha = (i + 1) / len(gaze_history)
-                    size = int(4 + 8 * alpha)
-                    color_intensity = int(255 * alpha)
-
-                    # Draw glow effect for trail
-                    cv2.circle(digital_twin, (hx, hy), size + 2, (0, color_intensity//2, 0), -1)
-                    cv2.circle(digital_twin, (hx, hy), size, (0, color_intensity, 0), -1)
-
-                # Draw current gaze point with enhanced visibility
-                # Outer glow
-                cv2.circle(digital_twin, (gaze_x, gaze_y), 16, (0, 100, 0), -1)
-                # Middle glow
-                cv2.circle(digital_twin, (gaze_x, gaze_y), 12, (0, 180, 0), -1)
-                # Inner bright point
-                cv2.circle(digital_twin, (gaze_x, gaze_y), 6, (0, 255, 0), -1)
-
-                # Draw crosshair for precise targeting
-                line_length = 10
-                cv2.line(digital_twin, (gaze_x - line_length, gaze_y), (gaze_x + line_length, gaze_y), (0, 255, 0), 1)
-                cv2.line(digital_twin, (gaze_x, gaze_y - line_length), (gaze_x, gaze_y + line_length), (0, 255, 0), 1)
-
-            # Add status messages at bottom
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.6
-            font_color = (0, 255, 0)
-            font_thickness = 1
-
-            cv2.putText(digital_twin, "✓ WebGazer loaded.",
-                       (10, canvas_height - 60),
-                       font, font_scale, font_color, font_thickness)
-
-            if not show_calibration:
-                cv2.putText(digital_twin, "✓ Calibration box closed.",
-                           (10, canvas_height - 40),
-                           font, font_scale, font_color, font_thickness)
-                cv2.putText(digital_twin, "✓ Mode 1 selected.",
-                           (10, canvas_height - 20),
-                           font, font_scale, font_color, font_thickness)
-
-            # Show the digital twin
-            cv2.imshow("WebGazer Style Tracker", digital_twin)
-
-            # Exit if ESC is pressed
-            key = cv2.waitKey(1)
+            if activated is exit_button:
+                # Exit button was activated
+                print("✅ Exit button activated")
+                break
+            elif activated is not None:
+                # Calibration button was activated
+                show_calibration = False
+                print("✅ Calibration box closed.")
+
+            # Skip redrawing when nothing visible changed since the last shown frame.
+            # Tracked faces animate every frame, so only face-free frames can be skipped.
+            frame_state = (gaze_x, gaze_y, gaze_detected, show_calibration, show_video,
+                           tuple((button.hover, button.dwell_time) for button in buttons),
+                           tuple(gaze_history))
+            if faces or frame_state != shown_state:
+                shown_state = frame_state
+
+                # Clear the reused canvas for this frame
+                digital_twin.fill(0)
+
+                # Draw faces
+                for (x, y, w, h) in faces:
+                    # Draw red rectangle around face on digital twin
+                    cv2.rectangle(digital_twin, (x, y), (x + w, y + h), (0, 0, 255), 2)
+
+                    # Draw WebGazer-style feature points on digital twin
+                    face_features.draw_points(digital_twin)
+
+                # Draw panel, buttons, gaze trail and status messages for the current state
+                render_fns[show_calibration, gaze_detected](digital_twin, gaze_x, gaze_y)
+
+                # Show the digital twin
+                cv2.imshow("WebGazer Style Tracker", digital_twin)
+
+            # Exit if ESC is pressed. pollKey() pumps GUI events without waitKey's 1 ms
+            # sleep; pacing already comes from waiting on the capture thread's next frame.
+            if has_poll_key:
+                key = cv2.pollKey()
+            elif frame_idx % 4 == 0:
+                key = cv2.waitKey(1)
+            else:
+                key = -1
             if key == 27:  # ESC key
                 break
             elif key == ord('v'):  # Toggle video/digital twin view
                 show_video = not show_video
 
-        # Clean up
-        cap.release()
-        cv2.destroyAllWindows()
         print("👋 Tracking completed")
 
     except KeyboardInterrupt:
         print("🛑 Interrupted by user")
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        print(f"📋 Traceback: {traceback.format_exc()}")
+        logging.exception("❌ Error: %s", e)
     finally:
-        # Clean up
-        try:
-            cap.release()
-            cv2.destroyAllWindows()
-        except:
-            pass
+        # Clean up: stop the capture thread, close windows, release the webcam
+        cleanup.close()
 
 if __name__ == "__main__":
     main()
@@ -17,8 +17,6 @@ import signal
 import json
 import re
 import platform
-import urllib.request
-from urllib.error import URLError
 
 # --- Configuration ---
 SCRIPT_UUID = "8e7d6c5b-4a3b-2c1d-0e9f-8a7b6c5d4e3f"
@@ -33,25 +31,110 @@ REQUIRED_DIRS = [
     "data/source",
     "data/output"
 ]
+CONNECTIVITY_PROBE = ("1.1.1.1", 53)  # Public DNS resolver; a TCP connect needs no TLS or DNS lookup
+# Shell probe for privileged capabilities; each check prints "<name>=<exit status>"
+CAPABILITY_PROBE = (
+    'command -v sudo >/dev/null 2>&1 && sudo -n true >/dev/null 2>&1; echo "sudo=$?"; '
+    'command -v docker >/dev/null 2>&1 && docker info >/dev/null 2>&1; echo "docker=$?"'
+)
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 
+# --- File Templates ---
+# Written whole with Path.write_text, one buffered write per file
+DOCKERFILE_TEMPLATE = """\
+# Mock Dockerfile for restricted environment
+FROM python:3.9-slim
+
+WORKDIR /app
+
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+
+COPY . .
+
+EXPOSE 8000
+
+CMD ["python", "-m", "uvicorn", "supagrok_snapshot_worker:app", "--host", "0.0.0.0", "--port", "8000"]
+"""
+
+DOCKER_COMPOSE_TEMPLATE = """\
+# Mock docker-compose.yml for restricted environment
+version: '3'
+
+services:
+  supagrok_snapshot_service:
+    build: .
+    image: supagrok/snapshot-tipiservice:local
+    container_name: supagrok_snapshot_service
+    ports:
+      - "8000:8000"
+    volumes:
+      - ./data/source:/app/data/source
+      - ./data/output:/app/data/output
+    restart: unless-stopped
+"""
+
+TEST_API_TEMPLATE = """\
+# Test API for restricted environment
+from fastapi import FastAPI
+from datetime import datetime
+import os
+
+app = FastAPI()
+
+@app.get('/health')
+async def health_check():
+    return {'status': 'healthy', 'timestamp': datetime.now().isoformat()}
+
+@app.get('/')
+async def root():
+    return {'message': 'Welcome to Supagrok Snapshot Service', 'version': '1.0.0'}
+
+@app.get('/info')
+async def info():
+    return {
+        'service': 'Supagrok Snapshot Service',
+        'version': '1.0.0',
+        'environment': 'restricted',
+        'hostname': os.uname().nodename,
+        'timestamp': datetime.now().isoformat()
+    }
+"""
+
+REQUIREMENTS_TEMPLATE = """\
+fastapi>=0.95.0
+uvicorn>=0.21.1
+pydantic>=1.10.7
+"""
+
 # --- Logging and Output Formatting ---
+LEVEL_COLORS = {
+    "ERROR": "\033[91m",  # Red
+    "WARN": "\033[93m",   # Yellow
+    "SUCCESS": "\033[92m", # Green
+    "INFO": "\033[94m",   # Blue
+    "STEP": "\033[95m",   # Purple
+    "DEBUG": "\033[96m"   # Cyan
+}
+RESET_COLOR = "\033[0m"
+
+# Per-level line prefixes, built once rather than on every log() call
+_LOG_PREFIXES = {level: f"{color}[" for level, color in LEVEL_COLORS.items()}
+_timestamp_cache = [None, ""]  # [epoch second, formatted timestamp]
+
+def _timestamp():
+    """Current local time as text, re-formatted at most once per second."""
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return _timestamp_cache[1]
+
 def log(level, message):
     """PRF7: Structured logging with timestamp and level."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    level_colors = {
-        "ERROR": "\033[91m",  # Red
-        "WARN": "\033[93m",   # Yellow
-        "SUCCESS": "\033[92m", # Green
-        "INFO": "\033[94m",   # Blue
-        "STEP": "\033[95m",   # Purple
-        "DEBUG": "\033[96m"   # Cyan
-    }
-    reset_color = "\033[0m"
-    
-    color = level_colors.get(level, level_colors["INFO"])
-    print(f"{color}[{timestamp}] [{level}] {message}{reset_color}")
+    prefix = _LOG_PREFIXES.get(level, _LOG_PREFIXES["INFO"])
+    sys.stdout.write(f"{prefix}{_timestamp()}] [{level}] {message}{RESET_COLOR}\n")
 
 def run_command(cmd_parts, check=True, capture_output=False, use_sudo=False):
     """PRF14, PRF18: Execute a command with proper error handling."""
@@ -82,6 +165,23 @@ def run_command(cmd_parts, check=True, capture_output=False, use_sudo=False):
         return None
 
 # --- Verification Functions ---
+def find_missing_dirs(dir_paths, listings=None):
+    """Return the dir_paths that don't exist, reading each parent directory only once."""
+    listings = {} if listings is None else listings
+    missing = []
+    for dir_path in dir_paths:
+        parent, name = os.path.split(dir_path)
+        parent = parent or "."
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries if entry.is_dir()}
+            except FileNotFoundError:
+                listings[parent] = set()
+        if name not in listings[parent]:
+            missing.append(dir_path)
+    return missing
+
 def verify_prerequisites():
     """PRF12: Verify all prerequisites are met."""
     log("STEP", "Verifying prerequisites...")
@@ -92,18 +192,18 @@ def verify_prerequisites():
         log("ERROR", f"Python 3.6+ required, found {python_version.major}.{python_version.minor}")
         return False
     
-    # Check required files
-    missing_files = []
-    for file in REQUIRED_FILES:
-        if not Path(file).exists():
-            missing_files.append(file)
+    # Check required files with one directory read instead of a stat() per file
+    with os.scandir(".") as entries:
+        present = {entry.name: entry.is_dir() for entry in entries}
+    missing_files = [file for file in REQUIRED_FILES if file not in present]
     
     if missing_files:
         log("ERROR", f"Missing required files: {', '.join(missing_files)}")
         return False
     
-    # Create required directories
-    for dir_path in REQUIRED_DIRS:
+    # Create only the required directories that are actually missing
+    cwd_dirs = {name for name, is_dir in present.items() if is_dir}
+    for dir_path in find_missing_dirs(REQUIRED_DIRS, {".": cwd_dirs}):
         Path(dir_path).mkdir(parents=True, exist_ok=True)
     
     # Check for PyYAML - not critical in restricted mode
@@ -129,18 +229,28 @@ def check_port_availability():
             log("SUCCESS", f"Port {APP_PORT} is available.")
             return True
 
+def probe_capabilities():
+    """Run the sudo and docker checks in one subprocess; returns {name: available}."""
+    capabilities = {"sudo": False, "docker": False}
+    try:
+        result = run_command(["sh", "-c", CAPABILITY_PROBE], check=False, capture_output=True)
+    except Exception:
+        return capabilities
+    for line in (result.stdout if result else "").splitlines():
+        name, _, status = line.partition("=")
+        if name in capabilities:
+            capabilities[name] = status.strip() == "0"
+    return capabilities
+
 def check_environment_restrictions():
     """PRF18, PRF20: Check environment restrictions."""
     log("STEP", "Checking environment restrictions...")
     
+    # Probe sudo and Docker together: one fork instead of up to four
+    capabilities = probe_capabilities()
+    
     # Check if we have sudo access
-    has_sudo = False
-    if shutil.which("sudo"):
-        try:
-            result = run_command(["sudo", "-n", "true"], check=False, capture_output=True)
-            has_sudo = result and result.returncode == 0
-        except:
-            has_sudo = False
+    has_sudo = capabilities["sudo"]
     
     if not has_sudo:
         log("WARN", "No sudo access detected. Running in restricted mode.")
@@ -159,24 +269,18 @@ def check_environment_restrictions():
         return False
     
     # Check if Docker is available
-    has_docker = shutil.which("docker") is not None
-    if has_docker:
-        try:
-            result = run_command(["docker", "info"], check=False, capture_output=True)
-            has_docker = result and result.returncode == 0
-        except:
-            has_docker = False
+    has_docker = capabilities["docker"]
     
     if not has_docker:
         log("WARN", "Docker not available. Container deployment will be skipped.")
     
-    # Check external connectivity
+    # Check external connectivity with a single TCP connect
     has_internet = False
     try:
-        urllib.request.urlopen("https://www.google.com", timeout=5)
+        socket.create_connection(CONNECTIVITY_PROBE, timeout=1.0).close()
         has_internet = True
         log("INFO", "Internet connectivity confirmed.")
-    except URLError:
+    except OSError:
         log("WARN", "No internet connectivity detected. Some features may be limited.")
     
     # Get server information
@@ -199,9 +303,10 @@ def setup_environment():
     
     # Create a test file in the source directory
     test_file_path = Path("data/source/test_file.txt")
-    with open(test_file_path, "w") as f:
-        f.write("This is a test file for the Supagrok Tipi Service.\n")
-        f.write(f"Created by ionos_deploy_restricted.py (UUID: {SCRIPT_UUID}) on {datetime.now().isoformat()}\n")
+    test_file_path.write_text(
+        "This is a test file for the Supagrok Tipi Service.\n"
+        f"Created by ionos_deploy_restricted.py (UUID: {SCRIPT_UUID}) on {datetime.now().isoformat()}\n"
+    )
     
     # Check and set permissions for data directories
     for dir_path in REQUIRED_DIRS:
@@ -216,11 +321,14 @@ def setup_environment():
     # Create .env file if it doesn't exist
     env_file = Path(".env")
     if not env_file.exists():
-        with open(env_file, "w") as f:
-            f.write(f"APP_PORT={APP_PORT}\n")
-            f.write("DEBUG=true\n")
-            f.write(f"DATA_SOURCE_DIR={os.path.abspath('data/source')}\n")
-            f.write(f"DATA_OUTPUT_DIR={os.path.abspath('data/output')}\n")
+        source_dir = os.path.abspath("data/source")
+        output_dir = os.path.abspath("data/output")
+        env_file.write_text(
+            f"APP_PORT={APP_PORT}\n"
+            "DEBUG=true\n"
+            f"DATA_SOURCE_DIR={source_dir}\n"
+            f"DATA_OUTPUT_DIR={output_dir}\n"
+        )
         log("INFO", "Created .env file with default settings.")
     
     log("SUCCESS", "Environment set up successfully.")
@@ -233,34 +341,13 @@ def create_mock_docker_files():
     # Create Dockerfile if it doesn't exist
     dockerfile = Path("Dockerfile")
     if not dockerfile.exists():
-        with open(dockerfile, "w") as f:
-            f.write("# Mock Dockerfile for restricted environment\n")
-            f.write("FROM python:3.9-slim\n\n")
-            f.write("WORKDIR /app\n\n")
-            f.write("COPY requirements.txt .\n")
-            f.write("RUN pip install --no-cache-dir -r requirements.txt\n\n")
-            f.write("COPY . .\n\n")
-            f.write("EXPOSE 8000\n\n")
-            f.write('CMD ["python", "-m", "uvicorn", "supagrok_snapshot_worker:app", "--host", "0.0.0.0", "--port", "8000"]\n')
+        dockerfile.write_text(DOCKERFILE_TEMPLATE)
         log("INFO", "Created mock Dockerfile.")
     
     # Create docker-compose.yml if it doesn't exist
     docker_compose = Path("docker-compose.yml")
     if not docker_compose.exists():
-        with open(docker_compose, "w") as f:
-            f.write("# Mock docker-compose.yml for restricted environment\n")
-            f.write("version: '3'\n\n")
-            f.write("services:\n")
-            f.write("  supagrok_snapshot_service:\n")
-            f.write("    build: .\n")
-            f.write("    image: supagrok/snapshot-tipiservice:local\n")
-            f.write("    container_name: supagrok_snapshot_service\n")
-            f.write("    ports:\n")
-            f.write("      - \"8000:8000\"\n")
-            f.write("    volumes:\n")
-            f.write("      - ./data/source:/app/data/source\n")
-            f.write("      - ./data/output:/app/data/output\n")
-            f.write("    restart: unless-stopped\n")
+        docker_compose.write_text(DOCKER_COMPOSE_TEMPLATE)
         log("INFO", "Created mock docker-compose.yml.")
     
     log("SUCCESS", "Mock Docker files created successfully.")
@@ -273,36 +360,13 @@ def create_test_api():
     # Create supagrok_snapshot_worker.py if it doesn't exist
     api_file = Path("supagrok_snapshot_worker.py")
     if not api_file.exists():
-        with open(api_file, "w") as f:
-            f.write("# Test API for restricted environment\n")
-            f.write("from fastapi import FastAPI\n")
-            f.write("from datetime import datetime\n")
-            f.write("import os\n\n")
-            f.write("app = FastAPI()\n\n")
-            f.write("@app.get('/health')\n")
-            f.write("async def health_check():\n")
-            f.write("    return {'status': 'healthy', 'timestamp': datetime.now().isoformat()}\n\n")
-            f.write("@app.get('/')\n")
-            f.write("async def root():\n")
-            f.write("    return {'message': 'Welcome to Supagrok Snapshot Service', 'version': '1.0.0'}\n\n")
-            f.write("@app.get('/info')\n")
-            f.write("async def info():\n")
-            f.write("    return {\n")
-            f.write("        'service': 'Supagrok Snapshot Service',\n")
-            f.write("        'version': '1.0.0',\n")
-            f.write("        'environment': 'restricted',\n")
-            f.write("        'hostname': os.uname().nodename,\n")
-            f.write("        'timestamp': datetime.now().isoformat()\n")
-            f.write("    }\n")
+        api_file.write_text(TEST_API_TEMPLATE)
         log("INFO", "Created test API file.")
     
     # Create requirements.txt if it doesn't exist
     req_file = Path("requirements.txt")
     if not req_file.exists():
-        with open(req_file, "w") as f:
-            f.write("fastapi>=0.95.0\n")
-            f.write("uvicorn>=0.21.1\n")
-            f.write("pydantic>=1.10.7\n")
+        req_file.write_text(REQUIREMENTS_TEMPLATE)
         log("INFO", "Created requirements.txt file.")
     
     log("SUCCESS", "Test API created successfully.")
@@ -313,12 +377,11 @@ def install_dependencies():
     log("STEP", "Installing Python dependencies...")
     
     # Check if pip is available
-    if not shutil.which("pip") and not shutil.which("pip3"):
+    pip_cmd = shutil.which("pip3") or shutil.which("pip")
+    if not pip_cmd:
         log("ERROR", "pip/pip3 not found. Cannot install dependencies.")
         return False
     
-    pip_cmd = shutil.which("pip3") or shutil.which("pip")
-    
     # Create a virtual environment
     venv_dir = Path("venv")
     if not venv_dir.exists():